@@ -3,13 +3,40 @@ import asyncio
 import json
 import sys
 import os
+import re
 from datetime import datetime, timedelta
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+import anyio
 import time
+import atexit
+import threading
+from dataclasses import dataclass, field
+
+# Prefer orjson for MCP payloads; fall back to the standard library
+try:
+    from orjson import loads as loads_json
+except ImportError:
+    loads_json = json.loads
+
+# Seconds a server has to answer the Test Connections ping
+PING_TIMEOUT = 5
+
+# Task count reported by the Notion server, e.g. "Created 8 tasks from ..."
+_CREATED_RE = re.compile(r'Created (\d+) tasks')
+
+# One card in the Today's Events tab
+_EVENT_CARD_TEMPLATE = """
+<div class="event-card">
+    <h3>📅 {title}</h3>
+    <p><strong>🕒 Time:</strong> {start_time}</p>
+    <p><strong>📍 Location:</strong> {location}</p>
+    <p><strong>📝 Description:</strong> {description}</p>
+    <p><strong>👥 Attendees:</strong> {attendees} people</p>
+</div>
+"""
 
 # Page configuration
 st.set_page_config(
@@ -91,134 +118,312 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class StreamlitMCPDashboard:
-    def __init__(self):
-        self.calendar_server = "src/calendar_server.py"
-        self.notion_server = "src/notion_server.py"
-        
-        # Initialize session state
-        if 'events' not in st.session_state:
-            st.session_state.events = []
-        if 'tasks' not in st.session_state:
-            st.session_state.tasks = []
-        if 'sync_history' not in st.session_state:
-            st.session_state.sync_history = []
-        if 'stats' not in st.session_state:
-            st.session_state.stats = {
-                'events_today': 0,
-                'tasks_created': 0,
-                'action_items': 0,
-                'time_saved': 0
-            }
+def _root_cause(exc):
+    """Describe the innermost error of a (nested) task-group failure, for display."""
+    while getattr(exc, 'exceptions', None):
+        exc = exc.exceptions[0]
+    # Some transport errors (e.g. a dead server's broken pipe) carry no message
+    return str(exc) or type(exc).__name__
+
+@dataclass
+class MCPClient:
+    """Session to one stdio MCP server, owned by a single task.
     
-    async def get_calendar_events(self, date_str=None):
-        """Fetch calendar events from MCP server."""
+    The task enters and exits the stdio client, so its task group never exits
+    in a different task than it entered. Each server gets its own client, so
+    one that fails to start or dies doesn't take the others down.
+    """
+    session: ClientSession = None
+    tools: list = field(default_factory=list)
+    _read: object = None
+    _closing: asyncio.Event = field(default_factory=asyncio.Event)
+    _task: asyncio.Task = None
+    
+    @classmethod
+    async def start(cls, params):
+        """Start the server described by `params` (StdioServerParameters)."""
+        client = cls()
+        ready = asyncio.get_running_loop().create_future()
+        client._task = asyncio.create_task(client._run(params, ready))
+        await ready
+        return client
+    
+    @property
+    def running(self):
+        # stdio_client closes the sending end of the read stream once the
+        # server's stdout does, i.e. when the process has exited
+        return (self._task is not None and not self._task.done()
+                and self._read.statistics().open_send_streams > 0)
+    
+    async def _run(self, params, ready):
         try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.calendar_server],
-            )
-            
-            async with stdio_client(server_params) as (read, write):
+            async with stdio_client(params) as (read, write):
                 async with ClientSession(read, write) as session:
                     await session.initialize()
                     
-                    if date_str:
-                        result = await session.call_tool("get_events_by_date", {"date": date_str})
-                    else:
-                        result = await session.call_tool("get_todays_events", {})
+                    # Tool lists don't change for the life of a server process
+                    self.tools = (await session.list_tools()).tools
+                    self.session, self._read = session, read
                     
-                    for content in result.content:
-                        if content.type == "text":
-                            try:
-                                events = json.loads(content.text)
-                                return events if isinstance(events, list) else []
-                            except json.JSONDecodeError:
-                                if "No events found" in content.text:
-                                    return []
-                                else:
-                                    st.error(f"Error parsing calendar data: {content.text}")
-                                    return []
+                    ready.set_result(None)
+                    await self._closing.wait()
         except Exception as e:
-            st.error(f"Error fetching calendar events: {e}")
-            return []
+            # After startup, callers see the failure as a closed session
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            self.session = None
+    
+    async def close(self):
+        """Close the session and stop the server process."""
+        self._closing.set()
+        await self._task
+
+class StreamlitMCPDashboard:
+    def __init__(self, calendar_server="src/calendar_server.py", notion_server="src/notion_server.py"):
+        self.calendar_server = calendar_server
+        self.notion_server = notion_server
+        self._servers = {
+            'calendar': StdioServerParameters(command=sys.executable, args=[calendar_server]),
+            'notion': StdioServerParameters(command=sys.executable, args=[notion_server]),
+        }
+        
+        # Long-lived MCP clients by server name, started by _client()
+        self._clients = {}
+        self._connect_locks = {name: asyncio.Lock() for name in self._servers}
+        self._server_mtimes = {}
+    
+    def _script_mtime(self, name):
+        return os.path.getmtime(self._servers[name].args[0])
+    
+    async def connect(self):
+        """Start every MCP server that isn't running, each on its own.
+        
+        Returns the startup error of each server that failed, by name.
+        """
+        results = await asyncio.gather(*(self._client(name) for name in self._servers), return_exceptions=True)
+        return {name: result for name, result in zip(self._servers, results) if isinstance(result, Exception)}
+    
+    async def _client(self, name):
+        """Client for one server, (re)starting the server if it isn't running."""
+        async with self._connect_locks[name]:
+            client = self._clients.get(name)
+            if client is None or not client.running:
+                if client is not None:
+                    await client.close()
+                self._server_mtimes[name] = self._script_mtime(name)
+                self._clients[name] = client = await MCPClient.start(self._servers[name])
+            return client
+    
+    async def _drop(self, name, client):
+        """Stop one server's client, unless it has already been replaced."""
+        async with self._connect_locks[name]:
+            if self._clients.get(name) is client:
+                del self._clients[name]
+                await client.close()
+    
+    async def _call_tool(self, name, tool, arguments):
+        """Call a tool on one server, replacing the server if its session has closed.
+        
+        A request that couldn't be sent is retried once on a fresh server. One
+        the server died while handling is not, since it may have partly run.
+        """
+        client = await self._client(name)
+        try:
+            return await client.session.call_tool(tool, arguments)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await self._drop(name, client)
+            client = await self._client(name)
+            return await client.session.call_tool(tool, arguments)
+        except McpError as e:
+            if e.error.code == CONNECTION_CLOSED:
+                await self._drop(name, client)
+            raise
+    
+    async def disconnect(self):
+        """Close every MCP session and stop the server processes."""
+        await asyncio.gather(*(self._drop(name, client) for name, client in list(self._clients.items())))
+    
+    async def get_calendar_events(self, date_str=None):
+        """Fetch calendar events from MCP server.
+        
+        Runs on the background loop thread, so failures are raised for the
+        caller to report rather than written to the page here.
+        """
+        if date_str:
+            result = await self._call_tool('calendar', "get_events_by_date", {"date": date_str})
+        else:
+            result = await self._call_tool('calendar', "get_todays_events", {})
+        
+        # Events arrive as one JSON array per content chunk
+        events = []
+        for content in result.content:
+            if content.type == "text":
+                try:
+                    chunk = loads_json(content.text)
+                except json.JSONDecodeError:
+                    if "No events found" in content.text:
+                        return []
+                    raise ValueError(f"unexpected response: {content.text}")
+                if isinstance(chunk, list):
+                    events.extend(chunk)
+        return events
     
     async def create_notion_tasks(self, events):
         """Create tasks in Notion from calendar events."""
         try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.notion_server],
+            result = await self._call_tool(
+                'notion',
+                "create_tasks_from_calendar_events", 
+                {
+                    "events": events,
+                    "extract_action_items": True
+                }
             )
             
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    events_json = json.dumps(events)
-                    result = await session.call_tool(
-                        "create_tasks_from_calendar_events", 
-                        {
-                            "events": events_json,
-                            "extract_action_items": True
-                        }
-                    )
-                    
-                    for content in result.content:
-                        if content.type == "text":
-                            return content.text
+            for content in result.content:
+                if content.type == "text":
+                    return content.text
                     
         except Exception as e:
-            return f"Error creating tasks: {e}"
+            return f"Error creating tasks: {_root_cause(e)}"
     
     async def test_servers(self):
-        """Test both MCP servers."""
-        results = {"calendar": False, "notion": False, "calendar_tools": 0, "notion_tools": 0}
+        """Test each MCP server on its own, so one failing doesn't hide the other.
         
-        # Test calendar server
-        try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.calendar_server],
-            )
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    results["calendar"] = True
-                    results["calendar_tools"] = len(tools.tools)
-        except Exception as e:
-            st.error(f"Calendar server error: {e}")
-        
-        # Test notion server
-        try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.notion_server],
-            )
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    results["notion"] = True
-                    results["notion_tools"] = len(tools.tools)
-        except Exception as e:
-            st.error(f"Notion server error: {e}")
+        Tool counts are cached at connect time; a server is only restarted
+        when it has stopped or its script has changed on disk. Each one is
+        pinged to check that it still answers.
+        """
+        results = {"calendar": False, "notion": False, "calendar_tools": 0, "notion_tools": 0, "errors": []}
         
+        checks = await asyncio.gather(*(self._check(name) for name in self._servers), return_exceptions=True)
+        for name, check in zip(self._servers, checks):
+            if isinstance(check, asyncio.TimeoutError):
+                results["errors"].append(f"{name.title()} server error: no response within {PING_TIMEOUT}s")
+            elif isinstance(check, Exception):
+                results["errors"].append(f"{name.title()} server error: {_root_cause(check)}")
+            else:
+                results[name] = True
+                results[f"{name}_tools"] = check
         return results
+    
+    async def _check(self, name):
+        """Ping one server, restarting it first if its script changed; return its tool count."""
+        client = self._clients.get(name)
+        if client is not None and self._server_mtimes[name] != self._script_mtime(name):
+            await self._drop(name, client)
+        
+        client = await self._client(name)
+        try:
+            await asyncio.wait_for(client.session.send_ping(), PING_TIMEOUT)
+        except Exception:
+            # Don't leave an unresponsive server in place for the next call
+            await self._drop(name, client)
+            raise
+        return len(client.tools)
+
+def init_session_state():
+    """Initialize per-browser-session state."""
+    if 'events' not in st.session_state:
+        st.session_state.events = []
+    if 'tasks' not in st.session_state:
+        st.session_state.tasks = []
+    if 'sync_history' not in st.session_state:
+        st.session_state.sync_history = []
+    if 'stats' not in st.session_state:
+        st.session_state.stats = {
+            'events_today': 0,
+            'tasks_created': 0,
+            'action_items': 0,
+            'time_saved': 0
+        }
+
+@st.cache_resource
+def get_dashboard(calendar_server="src/calendar_server.py", notion_server="src/notion_server.py"):
+    """Shared dashboard whose MCP sessions survive Streamlit reruns."""
+    dashboard = StreamlitMCPDashboard(calendar_server, notion_server)
+    
+    # Start the servers up front so the first click doesn't pay for it; a
+    # server that fails to start is retried, and reported, by the next call
+    run_async(dashboard.connect())
+    
+    atexit.register(lambda: run_async(dashboard.disconnect()))
+    return dashboard
+
+class AsyncLoopThread:
+    """Event loop running forever in a daemon thread.
+    
+    Streamlit runs each rerun in a fresh script thread, so the MCP sessions
+    need a loop that outlives any single rerun.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+@st.cache_resource
+def get_loop_thread():
+    """Shared background loop for all MCP calls."""
+    return AsyncLoopThread()
 
 def run_async(coro):
     """Helper function to run async code in Streamlit."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop_thread().loop).result()
+
+def fetch_events(dashboard, date_str=None):
+    """Fetch calendar events, reporting failures on the page."""
     try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        return run_async(dashboard.get_calendar_events(date_str))
+    except Exception as e:
+        st.error(f"Error fetching calendar events: {_root_cause(e)}")
+        return []
+
+@st.cache_data
+def render_events_html(events_key):
+    """Build the event cards once per distinct set of events."""
+    cards = []
+    for event_json in events_key:
+        event = json.loads(event_json)
+        description = event.get('description', 'No description')
+        cards.append(_EVENT_CARD_TEMPLATE.format_map({
+            'title': event.get('title', 'Untitled Event'),
+            'start_time': event.get('start_time', 'No time specified'),
+            'location': event.get('location', 'No location specified'),
+            'description': description[:100] + ('...' if len(description) > 100 else ''),
+            'attendees': len(event.get('attendees', [])),
+        }))
+    return "".join(cards)
+
+@st.cache_data
+def format_sync_history(history_key):
+    """Expander labels and bodies for the sync history, newest first."""
+    rows = []
+    for sync_json in reversed(history_key):
+        sync = json.loads(sync_json)
+        rows.append((
+            f"📅 {sync['type']} - {sync['timestamp']}",
+            f"**Events Processed:** {sync['events']}",
+            f"**Result:** {sync['result']}",
+        ))
+    return rows
+
+@st.cache_data
+def build_analytics(history_key):
+    """Chart data for the analytics tab, built once per distinct sync history."""
+    # Imported here so sessions that never open Analytics don't pay for pandas
+    import pandas as pd
     
-    return loop.run_until_complete(coro)
+    df_history = pd.DataFrame([json.loads(sync_json) for sync_json in history_key])
+    df_history['timestamp'] = pd.to_datetime(df_history['timestamp'])
+    
+    events_over_time = df_history[['timestamp', 'events']]
+    type_counts = df_history['type'].value_counts()
+    return events_over_time, type_counts
 
 def main():
-    dashboard = StreamlitMCPDashboard()
+    init_session_state()
+    dashboard = get_dashboard()
     
     # Header
     st.markdown("""
@@ -241,6 +446,8 @@ def main():
         if st.button("🔍 Test Connections", use_container_width=True):
             with st.spinner("Testing server connections..."):
                 results = run_async(dashboard.test_servers())
+                for error in results["errors"]:
+                    st.error(error)
                 
                 if results["calendar"]:
                     st.success(f"✅ Calendar Server: {results['calendar_tools']} tools")
@@ -260,7 +467,7 @@ def main():
         # Today's events
         if st.button("🔄 Sync Today's Events", use_container_width=True, type="primary"):
             with st.spinner("Fetching today's calendar events..."):
-                events = run_async(dashboard.get_calendar_events())
+                events = fetch_events(dashboard)
                 st.session_state.events = events
                 st.session_state.stats['events_today'] = len(events)
                 
@@ -272,16 +479,10 @@ def main():
                         result = run_async(dashboard.create_notion_tasks(events))
                         
                         # Parse result to count created tasks
-                        if "Created" in result and "tasks" in result:
-                            try:
-                                # Extract number of tasks created
-                                import re
-                                matches = re.findall(r'Created (\d+) tasks', result)
-                                if matches:
-                                    st.session_state.stats['tasks_created'] = int(matches[0])
-                                    st.session_state.stats['time_saved'] += len(events) * 15  # 15 min per event
-                            except:
-                                pass
+                        match = _CREATED_RE.search(result) if result else None
+                        if match:
+                            st.session_state.stats['tasks_created'] = int(match.group(1))
+                            st.session_state.stats['time_saved'] += len(events) * 15  # 15 min per event
                         
                         # Add to sync history
                         st.session_state.sync_history.append({
@@ -302,7 +503,7 @@ def main():
         if st.button("🔄 Sync Selected Date", use_container_width=True):
             date_str = selected_date.strftime('%Y-%m-%d')
             with st.spinner(f"Fetching events for {date_str}..."):
-                events = run_async(dashboard.get_calendar_events(date_str))
+                events = fetch_events(dashboard, date_str)
                 
                 if events:
                     st.success(f"✅ Found {len(events)} events for {date_str}!")
@@ -351,6 +552,9 @@ def main():
             delta=None
         )
     
+    # Hashable snapshot of the history for the cached renderers below
+    history_key = tuple(json.dumps(sync, sort_keys=True) for sync in st.session_state.sync_history)
+    
     # Main content tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📅 Today's Events", "✅ Recent Tasks", "📊 Analytics", "📝 Sync History"])
     
@@ -358,17 +562,8 @@ def main():
         st.header("📅 Today's Calendar Events")
         
         if st.session_state.events:
-            for i, event in enumerate(st.session_state.events):
-                with st.container():
-                    st.markdown(f"""
-                    <div class="event-card">
-                        <h3>📅 {event.get('title', 'Untitled Event')}</h3>
-                        <p><strong>🕒 Time:</strong> {event.get('start_time', 'No time specified')}</p>
-                        <p><strong>📍 Location:</strong> {event.get('location', 'No location specified')}</p>
-                        <p><strong>📝 Description:</strong> {event.get('description', 'No description')[:100]}{'...' if len(event.get('description', '')) > 100 else ''}</p>
-                        <p><strong>👥 Attendees:</strong> {len(event.get('attendees', []))} people</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            events_key = tuple(json.dumps(event, sort_keys=True) for event in st.session_state.events)
+            st.markdown(render_events_html(events_key), unsafe_allow_html=True)
         else:
             st.info("📅 No events loaded yet. Use the sync button in the sidebar to fetch today's events.")
     
@@ -393,28 +588,13 @@ def main():
         st.header("📊 Analytics")
         
         if st.session_state.sync_history:
-            # Create analytics charts
-            df_history = pd.DataFrame(st.session_state.sync_history)
-            df_history['timestamp'] = pd.to_datetime(df_history['timestamp'])
+            events_over_time, type_counts = build_analytics(history_key)
             
-            # Events over time
-            fig_events = px.line(
-                df_history, 
-                x='timestamp', 
-                y='events',
-                title='Events Synced Over Time',
-                color_discrete_sequence=['#667eea']
-            )
-            st.plotly_chart(fig_events, use_container_width=True)
+            st.subheader("Events Synced Over Time")
+            st.line_chart(events_over_time, x='timestamp', y='events', color='#667eea')
             
-            # Sync type distribution
-            fig_pie = px.pie(
-                df_history, 
-                names='type', 
-                title='Sync Types Distribution',
-                color_discrete_sequence=['#667eea', '#764ba2', '#4FC3F7']
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.subheader("Sync Types Distribution")
+            st.bar_chart(type_counts, color='#764ba2')
         else:
             st.info("📊 No sync data available yet. Perform some syncs to see analytics!")
     
@@ -422,10 +602,10 @@ def main():
         st.header("📝 Sync History")
         
         if st.session_state.sync_history:
-            for sync in reversed(st.session_state.sync_history):
-                with st.expander(f"📅 {sync['type']} - {sync['timestamp']}"):
-                    st.write(f"**Events Processed:** {sync['events']}")
-                    st.write(f"**Result:** {sync['result']}")
+            for label, events_line, result_line in format_sync_history(history_key):
+                with st.expander(label):
+                    st.write(events_line)
+                    st.write(result_line)
         else:
             st.info("📝 No sync history available yet.")
     
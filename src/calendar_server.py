@@ -1,6 +1,8 @@
 import asyncio
-import json
-from datetime import datetime, timedelta
+import functools
+import re
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Any, Sequence
 import os
 from dotenv import load_dotenv
@@ -14,6 +16,10 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
+
+from config import ACTION_RE, dumps_json
 
 # Load environment variables
 load_dotenv()
@@ -21,10 +27,105 @@ load_dotenv()
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Refresh the access token this long before it expires (expiry is naive UTC)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Partial response: only the event fields _format_events reads
+EVENT_FIELDS = 'items(summary,description,location,start(dateTime,date),attendees/email)'
+
+# Maximum number of calls in one Calendar API batch request
+BATCH_LIMIT = 50
+
+# Events per TextContent chunk; clients concatenate the JSON arrays
+EVENTS_PER_CHUNK = 25
+
+def _format_events(events):
+    """Reduce Google Calendar event resources to the fields the clients use."""
+    return [
+        {
+            'title': event.get('summary', 'No title'),
+            'start_time': event['start'].get('dateTime') or event['start'].get('date'),
+            'description': event.get('description', 'No description'),
+            'location': event.get('location', 'No location specified'),
+            'attendees': [attendee.get('email') for attendee in event.get('attendees', ())]
+        }
+        for event in events
+    ]
+
+@functools.lru_cache(maxsize=1)
+def _load_credentials():
+    """Load the user's Google credentials, refreshing or authorizing as needed."""
+    creds = None
+    
+    # Token file stores the user's access and refresh tokens
+    if os.path.exists('token.json'):
+        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    
+    # If there are no valid credentials, get them
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            if not os.path.exists('credentials.json'):
+                raise FileNotFoundError(
+                    "credentials.json file not found. Please download it from Google Cloud Console."
+                )
+            
+            flow = InstalledAppFlow.from_client_secrets_file(
+                'credentials.json', SCOPES)
+            creds = flow.run_local_server(port=0)
+        
+        _save_credentials(creds)
+    
+    return creds
+
+def _save_credentials(creds):
+    """Save credentials for the next run."""
+    with open('token.json', 'w') as token:
+        token.write(creds.to_json())
+
+def _refresh_credentials(creds):
+    """Refresh the access token in place and persist it."""
+    creds.refresh(Request())
+    _save_credentials(creds)
+
+@functools.lru_cache(maxsize=1)
+def _build_service():
+    """Build the Calendar API client once per process."""
+    # Use the discovery document bundled with googleapiclient instead of fetching it
+    return build('calendar', 'v3', credentials=_load_credentials(),
+                 cache_discovery=False, static_discovery=True)
+
+def _events_content(events):
+    """Formatted events as JSON array chunks, one TextContent per chunk."""
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps_json(_format_events(events[i:i + EVENTS_PER_CHUNK]))
+        )
+        for i in range(0, len(events), EVENTS_PER_CHUNK)
+    ]
+
 class CalendarMCPServer:
+    # Keyword matchers for _extract_meeting_details (substring semantics, any case)
+    _ACTION_RE = ACTION_RE
+    _TOPIC_RE = re.compile('|'.join(map(re.escape, [
+        'discuss', 'review', 'plan', 'strategy', 'budget', 'timeline', 'project'
+    ])), re.IGNORECASE)
+    
     def __init__(self):
         self.server = Server("calendar-mcp-server")
         self.service = None
+        self._creds = None
+        self._refresh_lock = asyncio.Lock()
+        # Per-worker-thread AuthorizedHttp (see _execute)
+        self._local = threading.local()
+        try:
+            self.service = _build_service()
+            self._creds = _load_credentials()
+        except Exception:
+            # Surfaced by the first tool call, which retries authentication
+            pass
         self._setup_handlers()
     
     def _setup_handlers(self):
@@ -66,6 +167,26 @@ class CalendarMCPServer:
                         "required": ["date"]
                     },
                 ),
+                types.Tool(
+                    name="get_events_batch",
+                    description="Get events for several dates in one call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "dates": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Dates in YYYY-MM-DD format"
+                            },
+                            "calendar_id": {
+                                "type": "string",
+                                "description": "Calendar ID (default: 'primary')",
+                                "default": "primary"
+                            }
+                        },
+                        "required": ["dates"]
+                    },
+                ),
                 types.Tool(
                     name="extract_meeting_details",
                     description="Extract and summarize details from a meeting/event",
@@ -95,6 +216,8 @@ class CalendarMCPServer:
                     return await self._get_todays_events(arguments)
                 elif name == "get_events_by_date":
                     return await self._get_events_by_date(arguments)
+                elif name == "get_events_batch":
+                    return await self._get_events_batch(arguments)
                 elif name == "extract_meeting_details":
                     return await self._extract_meeting_details(arguments)
                 else:
@@ -108,36 +231,37 @@ class CalendarMCPServer:
 
     async def _authenticate_google_calendar(self):
         """Authenticate with Google Calendar API."""
-        creds = None
-        
-        # Token file stores the user's access and refresh tokens
-        if os.path.exists('token.json'):
-            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+        # May refresh the token or run the OAuth flow, so keep it off the event loop
+        self.service = await asyncio.to_thread(_build_service)
+        self._creds = _load_credentials()
+
+    async def _ensure_fresh(self):
+        """Authenticate if needed and refresh the token shortly before it expires."""
+        if not self.service:
+            await self._authenticate_google_calendar()
+            return
         
-        # If there are no valid credentials, get them
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError(
-                        "credentials.json file not found. Please download it from Google Cloud Console."
-                    )
-                
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    'credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            # Save credentials for next run
-            with open('token.json', 'w') as token:
-                token.write(creds.to_json())
+        async with self._refresh_lock:
+            expiry = self._creds.expiry
+            if (self._creds.refresh_token and expiry
+                    and expiry - datetime.now(timezone.utc).replace(tzinfo=None) < TOKEN_REFRESH_MARGIN):
+                await asyncio.to_thread(_refresh_credentials, self._creds)
+
+    def _execute(self, request):
+        """Execute a Calendar API request with this worker thread's HTTP client.
         
-        self.service = build('calendar', 'v3', credentials=creds)
+        httplib2 connections are not thread-safe, so requests run through
+        asyncio.to_thread must not share the service's default client. Each
+        worker thread keeps its own AuthorizedHttp and reuses its connection.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None or http.credentials is not self._creds:
+            http = self._local.http = AuthorizedHttp(self._creds, http=httplib2.Http())
+        return request.execute(http=http)
 
     async def _get_todays_events(self, arguments: dict) -> list[types.TextContent]:
         """Get today's events from Google Calendar."""
-        if not self.service:
-            await self._authenticate_google_calendar()
+        await self._ensure_fresh()
         
         calendar_id = arguments.get('calendar_id', 'primary')
         
@@ -149,13 +273,16 @@ class CalendarMCPServer:
         tomorrow_iso = tomorrow.isoformat() + 'Z'
         
         try:
-            events_result = self.service.events().list(
+            # Blocking HTTP call; keep it off the server's event loop
+            events_result = await asyncio.to_thread(self._execute, self.service.events().list(
                 calendarId=calendar_id,
                 timeMin=today_iso,
                 timeMax=tomorrow_iso,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=EVENT_FIELDS,
+                maxResults=250
+            ))
             
             events = events_result.get('items', [])
             
@@ -165,27 +292,7 @@ class CalendarMCPServer:
                     text="No events found for today."
                 )]
             
-            # Format events
-            event_list = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                summary = event.get('summary', 'No title')
-                description = event.get('description', 'No description')
-                location = event.get('location', 'No location specified')
-                
-                event_info = {
-                    'title': summary,
-                    'start_time': start,
-                    'description': description,
-                    'location': location,
-                    'attendees': [attendee.get('email') for attendee in event.get('attendees', [])]
-                }
-                event_list.append(event_info)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(event_list, indent=2)
-            )]
+            return _events_content(events)
             
         except Exception as e:
             return [types.TextContent(
@@ -195,8 +302,7 @@ class CalendarMCPServer:
 
     async def _get_events_by_date(self, arguments: dict) -> list[types.TextContent]:
         """Get events for a specific date."""
-        if not self.service:
-            await self._authenticate_google_calendar()
+        await self._ensure_fresh()
         
         date_str = arguments['date']
         calendar_id = arguments.get('calendar_id', 'primary')
@@ -210,13 +316,16 @@ class CalendarMCPServer:
             start_iso = start_of_day.isoformat() + 'Z'
             end_iso = end_of_day.isoformat() + 'Z'
             
-            events_result = self.service.events().list(
+            # Blocking HTTP call; keep it off the server's event loop
+            events_result = await asyncio.to_thread(self._execute, self.service.events().list(
                 calendarId=calendar_id,
                 timeMin=start_iso,
                 timeMax=end_iso,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                fields=EVENT_FIELDS,
+                maxResults=250
+            ))
             
             events = events_result.get('items', [])
             
@@ -226,33 +335,72 @@ class CalendarMCPServer:
                     text=f"No events found for {date_str}."
                 )]
             
-            # Format events
-            event_list = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                summary = event.get('summary', 'No title')
-                description = event.get('description', 'No description')
-                location = event.get('location', 'No location specified')
-                
-                event_info = {
-                    'title': summary,
-                    'start_time': start,
-                    'description': description,
-                    'location': location,
-                    'attendees': [attendee.get('email') for attendee in event.get('attendees', [])]
-                }
-                event_list.append(event_info)
+            return _events_content(events)
             
+        except ValueError:
             return [types.TextContent(
                 type="text",
-                text=json.dumps(event_list, indent=2)
+                text="Invalid date format. Please use YYYY-MM-DD."
             )]
-            
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"Error fetching events: {str(e)}"
+            )]
+
+    async def _get_events_batch(self, arguments: dict) -> list[types.TextContent]:
+        """Get events for several dates with a single batched Calendar API request."""
+        await self._ensure_fresh()
+        
+        dates = list(dict.fromkeys(arguments['dates']))  # batch request IDs must be unique
+        calendar_id = arguments.get('calendar_id', 'primary')
+        
+        try:
+            ranges = []
+            for date_str in dates:
+                start_of_day = datetime.strptime(date_str, '%Y-%m-%d')
+                end_of_day = start_of_day + timedelta(days=1)
+                ranges.append((date_str, (start_of_day.isoformat() + 'Z', end_of_day.isoformat() + 'Z')))
         except ValueError:
             return [types.TextContent(
                 type="text",
                 text="Invalid date format. Please use YYYY-MM-DD."
             )]
+        
+        results = {}
+        
+        def collect(request_id, response, exception):
+            if exception is not None:
+                raise exception
+            results[request_id] = response
+        
+        try:
+            # The Calendar API accepts up to 50 calls per batch; each batch is
+            # one HTTP round-trip
+            for i in range(0, len(ranges), BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=collect)
+                for date_str, (time_min, time_max) in ranges[i:i + BATCH_LIMIT]:
+                    batch.add(self.service.events().list(
+                        calendarId=calendar_id,
+                        timeMin=time_min,
+                        timeMax=time_max,
+                        singleEvents=True,
+                        orderBy='startTime',
+                        fields=EVENT_FIELDS,
+                        maxResults=250
+                    ), request_id=date_str)
+                await asyncio.to_thread(self._execute, batch)
+            
+            events_by_date = {
+                date_str: _format_events(results.get(date_str, {}).get('items', []))
+                for date_str in dates
+            }
+            
+            return [types.TextContent(
+                type="text",
+                text=dumps_json(events_by_date)
+            )]
+            
         except Exception as e:
             return [types.TextContent(
                 type="text",
@@ -271,23 +419,17 @@ class CalendarMCPServer:
             'attendees_mentioned': []
         }
         
-        # Simple keyword extraction for action items
-        action_keywords = ['todo', 'action item', 'follow up', 'assign', 'task', 'deadline', 'due']
-        lines = event_text.lower().split('\n')
-        
-        for line in lines:
-            if any(keyword in line for keyword in action_keywords):
+        # Single pass over the lines with precompiled keyword patterns; they
+        # ignore case, so the text is never copied just to lowercase it
+        for line in event_text.splitlines():
+            if self._ACTION_RE.search(line):
                 analysis['potential_action_items'].append(line.strip())
-        
-        # Extract potential topics (sentences with key business words)
-        topic_keywords = ['discuss', 'review', 'plan', 'strategy', 'budget', 'timeline', 'project']
-        for line in lines:
-            if any(keyword in line.lower() for keyword in topic_keywords):
+            if self._TOPIC_RE.search(line):
                 analysis['key_topics'].append(line.strip())
         
         return [types.TextContent(
             type="text",
-            text=json.dumps(analysis, indent=2)
+            text=dumps_json(analysis)
         )]
 
     async def run(self):
@@ -1,259 +1,445 @@
+import argparse
 import asyncio
-import json
+import hashlib
+import os
+import re
+import sqlite3
 import sys
+import time
+from contextlib import AsyncExitStack
 from datetime import datetime
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from config import ACTION_RE, loads_json
+
+# A line holding an action-item keyword (config.ACTION_RE), captured without
+# its leading list markers ("- ", "* "); scanned straight over the text
+_ACTION_LINE_RE = re.compile(
+    rf'(?m)^[\s\-\*]*([^\n]*?(?:{ACTION_RE.pattern})[^\n]*)$', re.IGNORECASE
+)
+
+# Seconds the connection test waits for each server to start and answer
+PROBE_TIMEOUT = 30
+
+# Events already pushed to Notion, so repeated runs only send new ones
+SYNC_CACHE_FILE = ".cache/synced.db"
+SYNC_CACHE_DAYS = 30
+
+# Words that mark an event description as meeting notes worth summarizing
+_MEETING_RE = re.compile(r'meeting|discuss|review|action|todo|follow', re.IGNORECASE)
+
+def _read_events(result):
+    """Decode a calendar tool result into (events, message).
+    
+    Events arrive as one JSON array per text chunk and are decoded chunk by
+    chunk. Anything that isn't an array (e.g. "No events found ...") is plain
+    text from the server and comes back as `message` without being parsed.
+    """
+    events = []
+    for content in result.content:
+        if content.type == "text":
+            if not content.text.startswith('['):
+                return [], content.text
+            events.extend(loads_json(content.text))
+    return events, None
+
+def _root_cause(exc):
+    """Describe the innermost error of a (nested) task-group failure, for display."""
+    while getattr(exc, 'exceptions', None):
+        exc = exc.exceptions[0]
+    # Some transport errors (e.g. a dead server's broken pipe) carry no message
+    return str(exc) or type(exc).__name__
+
+def _is_meeting(description):
+    """Whether an event description looks like meeting notes worth summarizing."""
+    # Cheapest checks first: most events have no real description
+    if len(description) <= 50 or description == 'No description':
+        return False
+    return _MEETING_RE.search(description) is not None
+
+def _event_key(event):
+    """Stable identity of an event across runs."""
+    return hashlib.md5(f"{event.get('title', '')}|{event.get('start_time', '')}".encode()).hexdigest()
+
+def _unique_events(events):
+    """Drop repeats of the same (title, start_time), keeping the first.
+    
+    Merged calendars and multi-day events can list one event more than
+    once; each copy would otherwise cost its own Notion requests.
+    """
+    seen = set()
+    unique = []
+    for event in events:
+        key = (event.get('title', ''), event.get('start_time', ''))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(event)
+    return unique
+
 class CalendarToNotionWorkflow:
     def __init__(self):
         self.calendar_server = "src/calendar_server.py"
         self.notion_server = "src/notion_server.py"
+        self._calendar_params = StdioServerParameters(
+            command=sys.executable,
+            args=[self.calendar_server],
+        )
+        self._notion_params = StdioServerParameters(
+            command=sys.executable,
+            args=[self.notion_server],
+        )
+        
+        # Synced-event cache, open while connected (see connect())
+        self._synced = None
+        
+        # Sessions stay open for the workflow's lifetime (see connect())
+        self._stack = AsyncExitStack()
+        self.calendar_session = None
+        self.notion_session = None
+    
+    def _open_sync_cache(self):
+        """Open the synced-event cache and drop entries past retention."""
+        os.makedirs(os.path.dirname(SYNC_CACHE_FILE), exist_ok=True)
+        db = sqlite3.connect(SYNC_CACHE_FILE)
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS synced(h TEXT PRIMARY KEY, ts INTEGER)")
+            db.execute(
+                "DELETE FROM synced WHERE ts < ?",
+                (int(time.time()) - SYNC_CACHE_DAYS * 86400,)
+            )
+        return db
+    
+    async def connect(self):
+        """Open the synced-event cache, start both MCP servers and open a session to each."""
+        if self._synced is None:
+            self._synced = self._open_sync_cache()
+        
+        self.calendar_session = await self._open(self._calendar_params)
+        self.notion_session = await self._open(self._notion_params)
+        
+        # The handshakes wait on each server's interpreter startup; overlap them
+        await asyncio.gather(
+            self.calendar_session.initialize(),
+            self.notion_session.initialize(),
+        )
+    
+    async def _open(self, params):
+        """Spawn a server and return an uninitialized session to it.
+        
+        Contexts are entered here, in the caller's task, because the stdio
+        client must be exited from the same task that entered it.
+        """
+        read, write = await self._stack.enter_async_context(stdio_client(params))
+        return await self._stack.enter_async_context(ClientSession(read, write))
+    
+    async def test_connections(self):
+        """Start each server on its own and report it, so one failing doesn't hide the other.
+        
+        Returns whether both servers answered.
+        """
+        print("🔧 Testing server connections...")
+        
+        results = await asyncio.gather(
+            self._probe(self._calendar_params),
+            self._probe(self._notion_params),
+            return_exceptions=True
+        )
+        for name, result in zip(("Calendar", "Notion"), results):
+            if isinstance(result, asyncio.TimeoutError):
+                print(f"❌ {name} server error: no response within {PROBE_TIMEOUT}s")
+            elif isinstance(result, Exception):
+                print(f"❌ {name} server error: {_root_cause(result)}")
+            else:
+                print(f"✅ {name} server: {len(result.tools)} tools available")
+        return not any(isinstance(result, BaseException) for result in results)
+    
+    async def _probe(self, params):
+        """Start one server, list its tools and stop it again.
+        
+        Each probe runs in its own task and enters and exits its own stdio
+        client there, so the two servers are checked independently.
+        """
+        async def list_tools():
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    return await session.list_tools()
+        
+        return await asyncio.wait_for(list_tools(), PROBE_TIMEOUT)
+    
+    async def disconnect(self):
+        """Close both sessions, stop the server processes and close the cache."""
+        await self._stack.aclose()
+        self.calendar_session = None
+        self.notion_session = None
+        if self._synced is not None:
+            self._synced.close()
+            self._synced = None
+    
+    async def __aenter__(self):
+        try:
+            await self.connect()
+        except BaseException:
+            await self.disconnect()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
     
     async def run_daily_sync(self):
-        """Run the daily calendar to Notion sync workflow."""
+        """Run the daily calendar to Notion sync workflow; return whether it succeeded."""
         print("🚀 Starting Calendar to Notion Integration...")
         print("=" * 60)
         
         # Step 1: Get today's calendar events
         calendar_events = await self._get_calendar_events()
         
+        if calendar_events is None:
+            return False
         if not calendar_events:
             print("📅 No calendar events found for today.")
-            return
+            return True
         
         # Step 2: Process events and create tasks in Notion
-        await self._process_events_to_notion(calendar_events)
+        if not await self._process_events_to_notion(calendar_events):
+            return False
         
         print("\n" + "=" * 60)
         print("✅ Daily sync completed successfully!")
+        return True
     
     async def _get_calendar_events(self):
-        """Fetch today's calendar events."""
+        """Fetch today's calendar events, or None if they couldn't be read."""
         print("📅 Fetching today's calendar events...")
         
         try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.calendar_server],
-            )
+            # Get today's events
+            result = await self.calendar_session.call_tool("get_todays_events", {})
             
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Get today's events
-                    result = await session.call_tool("get_todays_events", {})
-                    
-                    for content in result.content:
-                        if content.type == "text":
-                            try:
-                                events = json.loads(content.text)
-                                print(f"📊 Found {len(events)} calendar events")
-                                return events
-                            except json.JSONDecodeError:
-                                if "No events found" in content.text:
-                                    print("📅 No events scheduled for today")
-                                    return []
-                                else:
-                                    print(f"❌ Error parsing calendar data: {content.text}")
-                                    return []
+            events, message = _read_events(result)
+            if message is not None:
+                if "No events found" in message:
+                    print("📅 No events scheduled for today")
+                    return []
+                print(f"❌ Error parsing calendar data: {message}")
+                return None
+            
+            print(f"📊 Found {len(events)} calendar events")
+            return events
             
         except Exception as e:
             print(f"❌ Error fetching calendar events: {e}")
-            return []
+            return None
     
-    async def _process_events_to_notion(self, events):
-        """Process calendar events and create tasks in Notion."""
-        print(f"\n📝 Processing {len(events)} events for Notion...")
+    async def _process_events_to_notion(self, calendar_events):
+        """Process calendar events and create tasks in Notion.
+        
+        Returns False if any event's page or meeting summary wasn't created.
+        """
+        print(f"\n📝 Processing {len(calendar_events)} events for Notion...")
         
         try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.notion_server],
+            events = _unique_events(calendar_events)
+            if len(events) < len(calendar_events):
+                print(f"🔁 Skipping {len(calendar_events) - len(events)} duplicate events")
+            
+            keys = [_event_key(event) for event in events]
+            synced = self._synced_keys(keys)
+            if synced:
+                print(f"⏭️ Skipping {len(synced)} events already synced to Notion")
+                events = [event for event, key in zip(events, keys) if key not in synced]
+                keys = [key for key in keys if key not in synced]
+                if not events:
+                    return True
+            
+            # Convert events to tasks
+            result = await self.notion_session.call_tool(
+                "create_tasks_from_calendar_events", 
+                {
+                    "events": events,
+                    "extract_action_items": True
+                }
             )
             
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Convert events to tasks
-                    events_json = json.dumps(events)
-                    result = await session.call_tool(
-                        "create_tasks_from_calendar_events", 
-                        {
-                            "events": events_json,
-                            "extract_action_items": True
-                        }
-                    )
-                    
-                    for content in result.content:
-                        if content.type == "text":
-                            print(f"📋 Notion Result: {content.text}")
-                    
-                    # Also create meeting summaries for events with descriptions
-                    await self._create_meeting_summaries(session, events)
-                    
+            for content in result.content:
+                if content.type == "text":
+                    print(f"📋 Notion Result: {content.text}")
+            
+            # Only events whose page the server confirmed count as synced
+            created = (result.structuredContent or {}).get('created_events', ())
+            self._mark_synced([keys[index] for index in created])
+            succeeded = len(created) == len(events)
+            
+            # Also create meeting summaries, if any event has meeting notes
+            if any(_is_meeting(event.get('description') or '') for event in events):
+                succeeded &= await self._create_meeting_summaries(self.notion_session, events)
+            return succeeded
+            
         except Exception as e:
             print(f"❌ Error processing events to Notion: {e}")
+            return False
+    
+    def _synced_keys(self, keys):
+        """Return the subset of event keys already pushed to Notion."""
+        if not keys:
+            return set()
+        rows = self._synced.execute(
+            f"SELECT h FROM synced WHERE h IN ({','.join('?' * len(keys))})", keys
+        )
+        return {row[0] for row in rows}
+    
+    def _mark_synced(self, keys):
+        """Record event keys as pushed to Notion."""
+        if not keys:
+            return
+        now = int(time.time())
+        with self._synced:
+            self._synced.executemany(
+                "INSERT OR IGNORE INTO synced VALUES (?, ?)", [(key, now) for key in keys]
+            )
     
     async def _create_meeting_summaries(self, session, events):
-        """Create detailed meeting summaries for events with substantial content."""
+        """Create detailed meeting summaries for events with substantial content.
+        
+        Returns whether every meeting's summary page was created.
+        """
         print("\n📊 Creating meeting summaries...")
         
-        for event in events:
-            title = event.get('title', '')
-            description = event.get('description', '')
-            attendees = event.get('attendees', [])
-            start_time = event.get('start_time', '')
-            
-            # Only create summaries for events that look like meetings
-            if (description != 'No description' and 
-                len(description) > 50 and 
-                any(keyword in description.lower() for keyword in 
-                    ['meeting', 'discuss', 'review', 'action', 'todo', 'follow'])):
-                
-                # Extract date from start_time
-                meeting_date = datetime.now().strftime('%Y-%m-%d')
-                if start_time:
-                    try:
-                        if 'T' in start_time:
-                            meeting_date = start_time.split('T')[0]
-                        else:
-                            meeting_date = start_time
-                    except:
-                        pass
-                
-                # Extract action items from description
-                action_items = self._extract_action_items_simple(description)
-                
-                try:
-                    result = await session.call_tool(
-                        "create_meeting_summary",
-                        {
-                            "meeting_title": title,
-                            "meeting_date": meeting_date,
-                            "attendees": ", ".join(attendees) if attendees else "",
-                            "summary": description,
-                            "action_items": json.dumps(action_items)
-                        }
-                    )
-                    
-                    for content in result.content:
-                        if content.type == "text":
-                            print(f"📊 Meeting Summary: {content.text}")
-                            
-                except Exception as e:
-                    print(f"❌ Error creating meeting summary for '{title}': {e}")
+        # Default meeting date for events without a start time
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        
+        summaries = [
+            summary for summary in (self._summary_args(event, today_str) for event in events)
+            if summary is not None
+        ]
+        if not summaries:
+            return True
+        
+        # One tool call for every meeting instead of one per meeting
+        try:
+            result = await session.call_tool("create_meeting_summaries_bulk", {"summaries": summaries})
+            for content in result.content:
+                if content.type == "text":
+                    print(f"📊 Meeting Summary: {content.text}")
+            failed = (result.structuredContent or {}).get('failed_summaries')
+            return not result.isError and not failed
+        except Exception as e:
+            print(f"❌ Error creating meeting summaries: {e}")
+            return False
+    
+    def _summary_args(self, event, today_str):
+        """Build the meeting-summary arguments for one event, or None if it doesn't qualify."""
+        # Only create summaries for events that look like meetings
+        description = event.get('description') or ''
+        if not _is_meeting(description):
+            return None
+        
+        title = event.get('title', '')
+        attendees = event.get('attendees', [])
+        start_time = event.get('start_time', '')
+        
+        # Extract date from start_time
+        meeting_date = today_str
+        if start_time:
+            meeting_date = start_time.partition('T')[0] or start_time
+        
+        return {
+            "meeting_title": title,
+            "meeting_date": meeting_date,
+            "attendees": ", ".join(attendees) if attendees else "",
+            "summary": description,
+            # Extract action items from description
+            "action_items": self._extract_action_items_simple(description)
+        }
     
     def _extract_action_items_simple(self, text):
         """Simple action item extraction."""
-        action_keywords = ['todo', 'action item', 'follow up', 'assign', 'task', 'deadline', 'due']
-        lines = text.lower().split('\n')
         action_items = []
         
-        for line in lines:
-            line_stripped = line.strip()
-            if line_stripped and any(keyword in line for keyword in action_keywords):
-                clean_item = line_stripped.replace('- ', '').replace('* ', '').strip()
-                if clean_item and len(clean_item) > 10:
-                    action_items.append(clean_item[:80])  # Limit length
+        for match in _ACTION_LINE_RE.finditer(text):
+            clean_item = match.group(1).strip()
+            if len(clean_item) > 10:
+                action_items.append(clean_item[:80])  # Limit length
+                if len(action_items) == 3:  # Limit to 3 action items
+                    break
         
-        return action_items[:3]  # Limit to 3 action items
+        return action_items
     
     async def run_custom_date_sync(self, date_str):
-        """Run sync for a specific date (YYYY-MM-DD format)."""
+        """Run sync for a specific date (YYYY-MM-DD format); return whether it succeeded."""
         print(f"🚀 Starting Calendar to Notion sync for {date_str}...")
         print("=" * 60)
         
         try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[self.calendar_server],
-            )
+            # Get events for specific date
+            result = await self.calendar_session.call_tool("get_events_by_date", {"date": date_str})
+            
+            events, message = _read_events(result)
+            if message is not None:
+                if "No events found" in message:
+                    print(f"📅 No events found for {date_str}")
+                    return True
+                print(f"❌ Error parsing calendar data: {message}")
+                return False
+            
+            if events:
+                print(f"📊 Found {len(events)} events for {date_str}")
+                return await self._process_events_to_notion(events)
+            return True
             
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Get events for specific date
-                    result = await session.call_tool("get_events_by_date", {"date": date_str})
-                    
-                    events = []
-                    for content in result.content:
-                        if content.type == "text":
-                            try:
-                                events = json.loads(content.text)
-                                print(f"📊 Found {len(events)} events for {date_str}")
-                                break
-                            except json.JSONDecodeError:
-                                if "No events found" in content.text:
-                                    print(f"📅 No events found for {date_str}")
-                                    return
-                    
-                    if events:
-                        await self._process_events_to_notion(events)
-                    
         except Exception as e:
             print(f"❌ Error in custom date sync: {e}")
+            return False
 
-async def main():
-    """Main function with menu options."""
-    workflow = CalendarToNotionWorkflow()
-    
-    print("📅➡️📝 Calendar to Notion Integration Tool")
-    print("=" * 50)
-    print("1. Sync today's calendar events to Notion")
-    print("2. Sync specific date to Notion")
-    print("3. Test connection to both servers")
-    print("=" * 50)
-    
-    choice = input("Enter your choice (1-3): ").strip()
+def _date_arg(value):
+    """Validate a YYYY-MM-DD argument before any server is started."""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid date format. Please use YYYY-MM-DD.")
+    return value
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="📅➡️📝 Calendar to Notion Integration Tool")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('today', help="Sync today's calendar events to Notion")
+    date_parser = sub.add_parser('date', help="Sync a specific date to Notion")
+    date_parser.add_argument('date', type=_date_arg, help="Date in YYYY-MM-DD format")
+    sub.add_parser('test', help="Test connection to both servers")
+    return parser
+
+async def main(argv=None):
+    """Main function dispatching the command-line subcommands.
     
-    if choice == "1":
-        await workflow.run_daily_sync()
+    Returns the process exit status: 0 on success, 1 if a server couldn't be
+    reached or anything failed to sync, so cron and systemd can tell.
+    """
+    args = build_parser().parse_args(argv)
     
-    elif choice == "2":
-        date_input = input("Enter date (YYYY-MM-DD): ").strip()
+    if args.cmd == "test":
+        workflow = CalendarToNotionWorkflow()
         try:
-            datetime.strptime(date_input, '%Y-%m-%d')  # Validate date format
-            await workflow.run_custom_date_sync(date_input)
-        except ValueError:
-            print("❌ Invalid date format. Please use YYYY-MM-DD.")
+            succeeded = await workflow.test_connections()
+        finally:
+            await workflow.disconnect()
+        return 0 if succeeded else 1
     
-    elif choice == "3":
-        print("🔧 Testing server connections...")
-        
-        # Test calendar server
-        try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[workflow.calendar_server],
-            )
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    print(f"✅ Calendar server: {len(tools.tools)} tools available")
-        except Exception as e:
-            print(f"❌ Calendar server error: {e}")
-        
-        # Test Notion server
-        try:
-            server_params = StdioServerParameters(
-                command=sys.executable,
-                args=[workflow.notion_server],
-            )
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    print(f"✅ Notion server: {len(tools.tools)} tools available")
-        except Exception as e:
-            print(f"❌ Notion server error: {e}")
+    try:
+        async with CalendarToNotionWorkflow() as workflow:
+            if args.cmd == "today":
+                succeeded = await workflow.run_daily_sync()
+            
+            elif args.cmd == "date":
+                succeeded = await workflow.run_custom_date_sync(args.date)
+    
+    except Exception as e:
+        print(f"❌ Error connecting to MCP servers: {_root_cause(e)}")
+        return 1
     
-    else:
-        print("❌ Invalid choice. Please run again.")
+    return 0 if succeeded else 1
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
\ No newline at end of file
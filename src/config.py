@@ -1,28 +1,83 @@
+import json
 import os
+import re
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Google Calendar API Configuration
-GOOGLE_CALENDAR_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
-GOOGLE_CALENDAR_TOKEN_FILE = os.getenv('GOOGLE_TOKEN_FILE', 'token.json')
+@dataclass(frozen=True, slots=True)
+class Config:
+    # Google Calendar API Configuration
+    google_calendar_credentials_file: str
+    google_calendar_token_file: str
 
-# Notion API Configuration
-NOTION_API_KEY = os.getenv('NOTION_API_KEY')
-NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
+    # Notion API Configuration
+    notion_api_key: str | None
+    notion_database_id: str | None
 
-# Trello API Configuration  
-TRELLO_API_KEY = os.getenv('TRELLO_API_KEY')
-TRELLO_TOKEN = os.getenv('TRELLO_TOKEN')
-TRELLO_BOARD_ID = os.getenv('TRELLO_BOARD_ID')
+    # Trello API Configuration
+    trello_api_key: str | None
+    trello_token: str | None
+    trello_board_id: str | None
 
-# Jira Configuration
-JIRA_URL = os.getenv('JIRA_URL')
-JIRA_USERNAME = os.getenv('JIRA_USERNAME') 
-JIRA_API_TOKEN = os.getenv('JIRA_API_TOKEN')
-JIRA_PROJECT_KEY = os.getenv('JIRA_PROJECT_KEY')
+    # Jira Configuration
+    jira_url: str | None
+    jira_username: str | None
+    jira_api_token: str | None
+    jira_project_key: str | None
+
+# Read once at import; attribute access is a slot lookup from here on
+CONFIG = Config(
+    google_calendar_credentials_file=os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json'),
+    google_calendar_token_file=os.getenv('GOOGLE_TOKEN_FILE', 'token.json'),
+    notion_api_key=os.getenv('NOTION_API_KEY'),
+    notion_database_id=os.getenv('NOTION_DATABASE_ID'),
+    trello_api_key=os.getenv('TRELLO_API_KEY'),
+    trello_token=os.getenv('TRELLO_TOKEN'),
+    trello_board_id=os.getenv('TRELLO_BOARD_ID'),
+    jira_url=os.getenv('JIRA_URL'),
+    jira_username=os.getenv('JIRA_USERNAME'),
+    jira_api_token=os.getenv('JIRA_API_TOKEN'),
+    jira_project_key=os.getenv('JIRA_PROJECT_KEY'),
+)
 
 # Server Configuration
 MCP_SERVER_NAME = "calendar-task-integration"
-MCP_SERVER_VERSION = "0.1.0"
\ No newline at end of file
+MCP_SERVER_VERSION = "0.1.0"
+
+# Meeting-notes parsing: a line is an action item if it contains one of
+# these keywords in any case, including inside longer words ("Assigned",
+# "Deadlines"). Shared by the servers and the workflow.
+ACTION_KEYWORDS = ('todo', 'action item', 'follow up', 'assign', 'task', 'deadline', 'due')
+ACTION_RE = re.compile('|'.join(map(re.escape, ACTION_KEYWORDS)), re.IGNORECASE)
+
+# JSON for the servers and the workflow: orjson when installed, otherwise the
+# standard library. dumps_json returns compact text; dumps_json_bytes returns
+# the same encoded as UTF-8, ready to send as a request body.
+try:
+    import orjson
+
+    loads_json = orjson.loads
+    dumps_json_bytes = orjson.dumps
+
+    def dumps_json(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    loads_json = json.loads
+
+    def dumps_json(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+    def dumps_json_bytes(obj):
+        return dumps_json(obj).encode()
+
+def __getattr__(name):
+    """Keep the old module-level names (e.g. config.NOTION_API_KEY) working."""
+    if name.isupper():
+        try:
+            return getattr(CONFIG, name.lower())
+        except AttributeError:
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
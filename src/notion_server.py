@@ -1,152 +1,255 @@
 import asyncio
 import json
-from datetime import datetime
+import re
+import time
+from datetime import date, datetime
 from typing import Any, Sequence
 import os
 from dotenv import load_dotenv
-import requests
+import httpx
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 import mcp.types as types
 
+from config import ACTION_RE, dumps_json_bytes, loads_json
+
 # Load environment variables
 load_dotenv()
 
+# Stream-parse large Notion responses when ijson is available
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Most Notion requests allowed in flight at once
+NOTION_CONCURRENCY = 8
+
+# Page creations are queued and sent in batches of up to PAGE_BATCH_SIZE,
+# waiting at most PAGE_FLUSH_INTERVAL seconds for a batch to fill
+PAGE_BATCH_SIZE = 16
+PAGE_FLUSH_INTERVAL = 0.05
+
+# Seconds a get_tasks result is reused for the same filter
+TASKS_CACHE_TTL = 15.0
+
+# Read-only fallbacks for missing Notion page properties (see _get_tasks())
+_EMPTY = {}
+_UNTITLED = ({"text": {"content": "Untitled"}},)
+_UNKNOWN = {"name": "Unknown"}
+
+# Tool definitions never change, so list_tools hands out this one list
+_TOOLS = [
+    types.Tool(
+        name="create_task",
+        description="Create a new task in Notion database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Task title"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Task description",
+                    "default": ""
+                },
+                "due_date": {
+                    "type": "string",
+                    "description": "Due date in YYYY-MM-DD format",
+                    "default": ""
+                },
+                "priority": {
+                    "type": "string",
+                    "description": "Task priority (High, Medium, Low)",
+                    "enum": ["High", "Medium", "Low"],
+                    "default": "Medium"
+                },
+                "source": {
+                    "type": "string",
+                    "description": "Source of the task (e.g., Calendar, Meeting)",
+                    "default": "Calendar"
+                }
+            },
+            "required": ["title"]
+        },
+    ),
+    types.Tool(
+        name="create_tasks_from_calendar_events",
+        description="Create tasks from calendar events and extract action items",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "Calendar events as returned by the calendar server"
+                },
+                "extract_action_items": {
+                    "type": "boolean",
+                    "description": "Whether to extract action items from event descriptions",
+                    "default": True
+                }
+            },
+            "required": ["events"]
+        },
+    ),
+    types.Tool(
+        name="create_meeting_summary",
+        description="Create a meeting summary with action items in Notion",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "meeting_title": {
+                    "type": "string",
+                    "description": "Meeting title"
+                },
+                "meeting_date": {
+                    "type": "string",
+                    "description": "Meeting date in YYYY-MM-DD format"
+                },
+                "attendees": {
+                    "type": "string",
+                    "description": "Comma-separated list of attendees"
+                },
+                "summary": {
+                    "type": "string",
+                    "description": "Meeting summary/notes"
+                },
+                "action_items": {
+                    "type": "string",
+                    "description": "JSON string of action items"
+                }
+            },
+            "required": ["meeting_title", "summary"]
+        },
+    ),
+    types.Tool(
+        name="create_meeting_summaries_bulk",
+        description="Create several meeting summaries with action items in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "summaries": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "Meeting summaries, each with the create_meeting_summary arguments"
+                }
+            },
+            "required": ["summaries"]
+        },
+    ),
+    types.Tool(
+        name="get_tasks",
+        description="Get tasks from Notion database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filter_by": {
+                    "type": "string",
+                    "description": "Filter tasks by status, priority, or source",
+                    "default": ""
+                }
+            },
+            "required": []
+        },
+    )
+]
+
+class _ResponseReader:
+    """Async file-like view of an httpx response body, as ijson expects."""
+    
+    __slots__ = ('_chunks',)
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes(8192)
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str
+        if size == 0:
+            return b''
+        return await anext(self._chunks, b'')
+
+async def _iter_results(response: httpx.Response):
+    """Yield the `results` items of a Notion query response as they arrive."""
+    if ijson is None:
+        for page in loads_json(await response.aread()).get('results', ()):
+            yield page
+        return
+    async for page in ijson.items_async(_ResponseReader(response), 'results.item'):
+        yield page
+
 class NotionMCPServer:
+    # Every instance attribute lives in a slot; no per-instance __dict__
+    __slots__ = (
+        'server', 'notion_api_key', 'notion_database_id', 'notion_url',
+        '_headers', '_parent', '_client', '_request_limit',
+        '_pending', '_pages_queued', '_flusher', '_posting',
+        '_tasks_cache', '_dispatch',
+    )
+    
+    # Action-item keywords for _extract_action_items_from_text (substring semantics, any case)
+    _ACTION_RE = ACTION_RE
+    # Leading list marker ("- ", "* ") on an action item
+    _BULLET_RE = re.compile(r'^[-*]\s+')
+    
     def __init__(self):
         self.server = Server("notion-mcp-server")
         self.notion_api_key = os.getenv('NOTION_API_KEY')
         self.notion_database_id = os.getenv('NOTION_DATABASE_ID')
         self.notion_url = "https://api.notion.com/v1"
+        # Parent reference shared by every page payload; never mutated
+        self._parent = {"database_id": self.notion_database_id}
+        # Fixed for the process lifetime; set once on the shared HTTP client
+        self._headers = {
+            "Authorization": f"Bearer {self.notion_api_key}",
+            "Content-Type": "application/json",
+            "Notion-Version": "2022-06-28"
+        }
+        # One HTTP/2 client for every Notion call (see _get_client())
+        self._client: httpx.AsyncClient | None = None
+        self._request_limit = asyncio.Semaphore(NOTION_CONCURRENCY)
+        # Page creations waiting for the flusher (see _submit_page())
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._pages_queued = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        # Batches the flusher has started and not yet finished
+        self._posting: set[asyncio.Future] = set()
+        # get_tasks results by filter_by: (monotonic time, result)
+        self._tasks_cache: dict[str, tuple[float, list[types.TextContent]]] = {}
         self._setup_handlers()
     
     def _setup_handlers(self):
+        # Tool name -> handler, looked up once per call
+        self._dispatch = {
+            "create_task": self._create_task,
+            "create_tasks_from_calendar_events": self._create_tasks_from_calendar_events,
+            "create_meeting_summary": self._create_meeting_summary,
+            "create_meeting_summaries_bulk": self._create_meeting_summaries_bulk,
+            "get_tasks": self._get_tasks,
+        }
+
         @self.server.list_tools()
         async def handle_list_tools() -> list[types.Tool]:
             """List available Notion tools."""
-            return [
-                types.Tool(
-                    name="create_task",
-                    description="Create a new task in Notion database",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "title": {
-                                "type": "string",
-                                "description": "Task title"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "Task description",
-                                "default": ""
-                            },
-                            "due_date": {
-                                "type": "string",
-                                "description": "Due date in YYYY-MM-DD format",
-                                "default": ""
-                            },
-                            "priority": {
-                                "type": "string",
-                                "description": "Task priority (High, Medium, Low)",
-                                "enum": ["High", "Medium", "Low"],
-                                "default": "Medium"
-                            },
-                            "source": {
-                                "type": "string",
-                                "description": "Source of the task (e.g., Calendar, Meeting)",
-                                "default": "Calendar"
-                            }
-                        },
-                        "required": ["title"]
-                    },
-                ),
-                types.Tool(
-                    name="create_tasks_from_calendar_events",
-                    description="Create tasks from calendar events and extract action items",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "events": {
-                                "type": "string",
-                                "description": "JSON string of calendar events"
-                            },
-                            "extract_action_items": {
-                                "type": "boolean",
-                                "description": "Whether to extract action items from event descriptions",
-                                "default": True
-                            }
-                        },
-                        "required": ["events"]
-                    },
-                ),
-                types.Tool(
-                    name="create_meeting_summary",
-                    description="Create a meeting summary with action items in Notion",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "meeting_title": {
-                                "type": "string",
-                                "description": "Meeting title"
-                            },
-                            "meeting_date": {
-                                "type": "string",
-                                "description": "Meeting date in YYYY-MM-DD format"
-                            },
-                            "attendees": {
-                                "type": "string",
-                                "description": "Comma-separated list of attendees"
-                            },
-                            "summary": {
-                                "type": "string",
-                                "description": "Meeting summary/notes"
-                            },
-                            "action_items": {
-                                "type": "string",
-                                "description": "JSON string of action items"
-                            }
-                        },
-                        "required": ["meeting_title", "summary"]
-                    },
-                ),
-                types.Tool(
-                    name="get_tasks",
-                    description="Get tasks from Notion database",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "filter_by": {
-                                "type": "string",
-                                "description": "Filter tasks by status, priority, or source",
-                                "default": ""
-                            }
-                        },
-                        "required": []
-                    },
-                )
-            ]
+            return _TOOLS
 
         @self.server.call_tool()
         async def handle_call_tool(
             name: str, arguments: dict[str, Any] | None
-        ) -> list[types.TextContent]:
+        ) -> list[types.TextContent] | tuple[list[types.TextContent], dict]:
             """Handle tool calls."""
             if arguments is None:
                 arguments = {}
 
             try:
-                if name == "create_task":
-                    return await self._create_task(arguments)
-                elif name == "create_tasks_from_calendar_events":
-                    return await self._create_tasks_from_calendar_events(arguments)
-                elif name == "create_meeting_summary":
-                    return await self._create_meeting_summary(arguments)
-                elif name == "get_tasks":
-                    return await self._get_tasks(arguments)
-                else:
+                handler = self._dispatch.get(name)
+                if handler is None:
                     raise ValueError(f"Unknown tool: {name}")
+                return await handler(arguments)
             
             except Exception as e:
                 return [types.TextContent(
@@ -154,31 +257,160 @@ class NotionMCPServer:
                     text=f"Error executing {name}: {str(e)}"
                 )]
 
-    def _get_notion_headers(self):
-        """Get headers for Notion API requests."""
-        return {
-            "Authorization": f"Bearer {self.notion_api_key}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
-
-    async def _create_task(self, arguments: dict) -> list[types.TextContent]:
-        """Create a single task in Notion."""
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared Notion HTTP client, creating it on first use.
+        
+        HTTP/2 lets concurrent requests share one connection to Notion.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers=self._headers,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                timeout=30.0
+            )
+        return self._client
+
+    async def _submit_page(self, payload: dict) -> tuple[int, Any]:
+        """Queue a page creation for the next batch; return (status, body)."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_pages())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+        self._pages_queued.set()
+        return await future
+
+    async def _flush_pages(self):
+        """Send queued page creations to Notion in batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pages_queued.wait()
+            # Give concurrent callers a moment to join the batch
+            deadline = loop.time() + PAGE_FLUSH_INTERVAL
+            while len(self._pending) < PAGE_BATCH_SIZE and loop.time() < deadline:
+                self._pages_queued.clear()
+                try:
+                    await asyncio.wait_for(self._pages_queued.wait(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+            batch = self._pending[:PAGE_BATCH_SIZE]
+            del self._pending[:PAGE_BATCH_SIZE]
+            if not self._pending:
+                self._pages_queued.clear()
+            # Don't wait for the batch: one slow POST would hold up every page
+            # queued behind it. _request_limit caps the requests in flight.
+            posting = asyncio.gather(*(self._post_page(payload, future) for payload, future in batch))
+            self._posting.add(posting)
+            posting.add_done_callback(self._posting.discard)
+
+    async def _post_page(self, payload: dict, future: asyncio.Future):
+        """POST one page and resolve its caller's future with (status, body)."""
+        try:
+            async with self._request_limit:
+                response = await self._get_client().post(f"{self.notion_url}/pages", content=dumps_json_bytes(payload))
+            if response.status_code == 200:
+                result = (response.status_code, loads_json(response.content))
+            else:
+                result = (response.status_code, response.text)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self):
+        """Stop the page flusher and its batches, and close the shared Notion HTTP client."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        for posting in list(self._posting):
+            posting.cancel()
+        await asyncio.gather(*self._posting, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _create_task(
+        self, arguments: dict, _created_iso: str | None = None, to_dos: Sequence[str] = ()
+    ) -> list[types.TextContent]:
+        """Create a single task in Notion.
+        
+        Bulk callers pass one `_created_iso` timestamp for their whole batch.
+        `to_dos` become unchecked to-do blocks on the same page.
+        """
         if not self.notion_api_key or not self.notion_database_id:
             return [types.TextContent(
                 type="text",
                 text="Error: Notion API key or database ID not configured."
             )]
 
+        try:
+            page_id = await self._create_page(arguments, _created_iso, to_dos)
+            return [types.TextContent(
+                type="text",
+                text=f"✅ Task created successfully: '{arguments['title']}'\nPage ID: {page_id}"
+            )]
+
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ Error creating task: {str(e)}"
+            )]
+
+    async def _create_page(
+        self, arguments: dict, _created_iso: str | None = None, to_dos: Sequence[str] = ()
+    ) -> str:
+        """Create the Notion page for a task and return its page ID.
+        
+        Takes the create_task arguments. Raises if Notion isn't configured or
+        doesn't create the page, so bulk callers can tell each page's outcome.
+        """
+        if not self.notion_api_key or not self.notion_database_id:
+            raise RuntimeError("Notion API key or database ID not configured.")
+
         title = arguments['title']
         description = arguments.get('description', '')
         due_date = arguments.get('due_date', '')
         priority = arguments.get('priority', 'Medium')
         source = arguments.get('source', 'Calendar')
 
-        # Prepare the request payload
+        # Validate the due date first so the payload is built in one literal
+        if due_date:
+            try:
+                date.fromisoformat(due_date)
+            except ValueError:
+                due_date = ''  # Skip invalid date
+
+        # Page body: the description, then one to-do block per item
+        children = [
+            {
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {
+                    "rich_text": [{"type": "text", "text": {"content": description}}]
+                }
+            }
+        ] if description else []
+        children += [
+            {
+                "object": "block",
+                "type": "to_do",
+                "to_do": {
+                    "rich_text": [{"type": "text", "text": {"content": item}}],
+                    "checked": False
+                }
+            }
+            for item in to_dos
+        ]
+
+        # Prepare the request payload; optional fields only when provided
         payload = {
-            "parent": {"database_id": self.notion_database_id},
+            "parent": self._parent,
             "properties": {
                 "Name": {
                     "title": [{"text": {"content": title}}]
@@ -193,66 +425,40 @@ class NotionMCPServer:
                     "select": {"name": source}
                 },
                 "Created": {
-                    "date": {"start": datetime.now().isoformat()}
-                }
-            }
+                    "date": {"start": _created_iso or datetime.now().isoformat()}
+                },
+                **({"Due Date": {"date": {"start": due_date}}} if due_date else {})
+            },
+            **({"children": children} if children else {})
         }
 
-        # Add due date if provided
-        if due_date:
-            try:
-                datetime.strptime(due_date, '%Y-%m-%d')  # Validate date format
-                payload["properties"]["Due Date"] = {
-                    "date": {"start": due_date}
-                }
-            except ValueError:
-                pass  # Skip invalid date
-
-        # Add description if provided
-        if description:
-            payload["children"] = [
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": description}}]
-                    }
-                }
-            ]
-
-        try:
-            response = requests.post(
-                f"{self.notion_url}/pages",
-                headers=self._get_notion_headers(),
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return [types.TextContent(
-                    type="text",
-                    text=f"✅ Task created successfully: '{title}'\nPage ID: {result['id']}"
-                )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"❌ Error creating task: {response.status_code} - {response.text}"
-                )]
-
-        except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Error creating task: {str(e)}"
-            )]
-
-    async def _create_tasks_from_calendar_events(self, arguments: dict) -> list[types.TextContent]:
-        """Create tasks from calendar events with action item extraction."""
-        events_json = arguments['events']
+        status, result = await self._submit_page(payload)
+        if status != 200:
+            raise RuntimeError(f"{status} - {result}")
+        
+        # The task lists no longer reflect the database
+        self._tasks_cache.clear()
+        return result['id']
+
+    async def _create_tasks_from_calendar_events(
+        self, arguments: dict
+    ) -> list[types.TextContent] | tuple[list[types.TextContent], dict]:
+        """Create tasks from calendar events with action item extraction.
+        
+        Alongside the text, the result carries structured content listing the
+        indexes of the events whose page was created and of those that failed.
+        """
+        events = arguments['events']
         extract_action_items = arguments.get('extract_action_items', True)
 
         try:
-            events = json.loads(events_json)
-            created_tasks = []
+            # Older clients send the events as a JSON string
+            if isinstance(events, str):
+                events = loads_json(events)
+            pending = []
+            titles = []
+            items_per_event = []
+            now_iso = datetime.now().isoformat()
             
             for event in events:
                 title = event.get('title', 'Untitled Event')
@@ -263,13 +469,7 @@ class NotionMCPServer:
                 # Extract date from start_time for due date
                 due_date = ""
                 if start_time:
-                    try:
-                        if 'T' in start_time:
-                            due_date = start_time.split('T')[0]
-                        else:
-                            due_date = start_time
-                    except:
-                        pass
+                    due_date = start_time.partition('T')[0] or start_time
 
                 # Create main event task
                 event_description = f"📅 Calendar Event\n"
@@ -286,30 +486,49 @@ class NotionMCPServer:
                     'source': 'Calendar'
                 }
                 
-                result = await self._create_task(main_task_args)
-                created_tasks.append(f"Event: {title}")
-
-                # Extract action items if requested
+                # Extract action items if requested; they ride along as to-do
+                # blocks on the event's page, so each event is one request
+                action_items = ()
                 if extract_action_items and description != 'No description':
                     action_items = self._extract_action_items_from_text(description)
-                    
-                    for item in action_items:
-                        action_task_args = {
-                            'title': f"🎯 {item}",
-                            'description': f"Action item from meeting: {title}",
-                            'due_date': due_date,
-                            'priority': 'High',
-                            'source': 'Meeting'
-                        }
-                        
-                        await self._create_task(action_task_args)
-                        created_tasks.append(f"Action: {item}")
+                
+                pending.append(self._create_page(main_task_args, now_iso, action_items))
+                titles.append(title)
+                items_per_event.append(action_items)
 
-            return [types.TextContent(
-                type="text",
-                text=f"✅ Created {len(created_tasks)} tasks from calendar events:\n" + 
-                     "\n".join([f"• {task}" for task in created_tasks])
-            )]
+            # Send every page creation together; _request_limit caps the fan-out
+            results = await asyncio.gather(*pending, return_exceptions=True)
+
+            created_tasks = []
+            created_events = []
+            to_do_count = 0
+            failures = []
+            for index, (title, action_items, result) in enumerate(zip(titles, items_per_event, results)):
+                # Each result is the new page's ID, or the error that stopped it
+                if isinstance(result, Exception):
+                    failures.append((index, f"{title}: {str(result) or type(result).__name__}"))
+                    continue
+                created_events.append(index)
+                to_do_count += len(action_items)
+                created_tasks.append(f"Event: {title}")
+                created_tasks.extend(f"Action: {item}" for item in action_items)
+
+            # The headline counts pages; action items are to-dos on those pages
+            status = "✅" if not failures else "⚠️" if created_events else "❌"
+            text = f"{status} Created {len(created_events)} tasks"
+            if to_do_count:
+                text += f" ({to_do_count} action items as to-dos)"
+            text += " from calendar events:"
+            if created_tasks:
+                text += "\n" + "\n".join(f"• {task}" for task in created_tasks)
+            if failures:
+                text += (f"\n❌ Failed for {len(failures)} events:\n" +
+                         "\n".join(f"• {failure}" for _, failure in failures))
+
+            return [types.TextContent(type="text", text=text)], {
+                "created_events": created_events,
+                "failed_events": [index for index, _ in failures]
+            }
 
         except json.JSONDecodeError:
             return [types.TextContent(
@@ -324,30 +543,46 @@ class NotionMCPServer:
 
     def _extract_action_items_from_text(self, text: str) -> list[str]:
         """Extract action items from text."""
-        action_keywords = ['todo', 'action item', 'follow up', 'assign', 'task', 'deadline', 'due']
-        lines = text.lower().split('\n')
+        # One C-level scan of the whole text; most descriptions have no
+        # action items and never need splitting into lines
+        if not self._ACTION_RE.search(text):
+            return []
+        
         action_items = []
         
-        for line in lines:
+        for line in text.splitlines():
             line_stripped = line.strip()
-            if line_stripped and any(keyword in line for keyword in action_keywords):
+            if line_stripped and self._ACTION_RE.search(line_stripped):
                 # Clean up the action item
-                clean_item = line_stripped.replace('- ', '').replace('* ', '').strip()
+                clean_item = self._BULLET_RE.sub('', line_stripped)
                 if clean_item and len(clean_item) > 10:  # Avoid very short items
                     action_items.append(clean_item[:100])  # Limit length
+                    if len(action_items) == 5:  # Limit to 5 action items
+                        break
         
-        return action_items[:5]  # Limit to 5 action items
+        return action_items
 
     async def _create_meeting_summary(self, arguments: dict) -> list[types.TextContent]:
         """Create a meeting summary with action items."""
-        meeting_title = arguments['meeting_title']
-        meeting_date = arguments.get('meeting_date', datetime.now().strftime('%Y-%m-%d'))
-        attendees = arguments.get('attendees', '')
-        summary = arguments['summary']
-        action_items_json = arguments.get('action_items', '[]')
+        text, _ = await self._summarize_meeting(arguments, datetime.now().isoformat())
+        return [types.TextContent(type="text", text=text)]
 
+    async def _summarize_meeting(self, arguments: dict, now_iso: str) -> tuple[str, bool]:
+        """Create one meeting's summary page and action-item pages.
+        
+        Returns the meeting's result line and whether its summary page was
+        created. Never raises, so one bad meeting can't sink a bulk call.
+        """
         try:
-            action_items = json.loads(action_items_json) if action_items_json else []
+            meeting_title = arguments['meeting_title']
+            meeting_date = arguments.get('meeting_date', now_iso[:10])
+            attendees = arguments.get('attendees', '')
+            summary = arguments['summary']
+            action_items = arguments.get('action_items') or ()
+            
+            # create_meeting_summary takes the items as a JSON string
+            if isinstance(action_items, str):
+                action_items = loads_json(action_items)
             
             # Create meeting summary task
             meeting_description = f"📊 Meeting Summary\n"
@@ -368,10 +603,9 @@ class NotionMCPServer:
                 'source': 'Meeting'
             }
             
-            await self._create_task(summary_task_args)
+            pending = [self._create_page(summary_task_args, now_iso)]
             
             # Create individual action item tasks
-            created_actions = 0
             for item in action_items[:5]:  # Limit to 5 action items
                 action_task_args = {
                     'title': f"🎯 {item}",
@@ -381,24 +615,63 @@ class NotionMCPServer:
                     'source': 'Meeting'
                 }
                 
-                await self._create_task(action_task_args)
-                created_actions += 1
-
-            return [types.TextContent(
-                type="text",
-                text=f"✅ Created meeting summary and {created_actions} action items for: {meeting_title}"
-            )]
-
+                pending.append(self._create_page(action_task_args, now_iso))
+            
+            # Each result is a new page's ID, or the error that stopped it
+            summary_page, *action_pages = await asyncio.gather(*pending, return_exceptions=True)
+            if isinstance(summary_page, Exception):
+                raise summary_page
+            
+            action_errors = [page for page in action_pages if isinstance(page, Exception)]
+            created_actions = len(action_pages) - len(action_errors)
+            if not action_errors:
+                return f"✅ Created meeting summary and {created_actions} action items for: {meeting_title}", True
+            return (f"⚠️ Created meeting summary and {created_actions} action items for: {meeting_title}"
+                    f" ({len(action_errors)} action items failed: {action_errors[0]})"), True
+
+        except KeyError as e:
+            return f"❌ Error creating meeting summary: missing {e}", False
         except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Error creating meeting summary: {str(e)}"
-            )]
+            title = arguments.get('meeting_title', 'untitled meeting')
+            return f"❌ Error creating meeting summary for {title}: {str(e) or type(e).__name__}", False
+
+    async def _create_meeting_summaries_bulk(
+        self, arguments: dict
+    ) -> tuple[list[types.TextContent], dict]:
+        """Create a meeting summary for each entry; one result line per meeting.
+        
+        Alongside the text, the result carries structured content listing the
+        indexes of the meetings whose summary was created and of those that failed.
+        """
+        now_iso = datetime.now().isoformat()
+        results = await asyncio.gather(
+            *(self._summarize_meeting(summary_args, now_iso) for summary_args in arguments['summaries']),
+            return_exceptions=True
+        )
+        
+        lines = []
+        created = []
+        failed = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                result = (f"❌ Error creating meeting summary: {result}", False)
+            line, succeeded = result
+            lines.append(types.TextContent(type="text", text=line))
+            if succeeded:
+                created.append(index)
+            else:
+                failed.append(index)
+        
+        return lines, {"created_summaries": created, "failed_summaries": failed}
 
     async def _get_tasks(self, arguments: dict) -> list[types.TextContent]:
         """Get tasks from Notion database."""
         filter_by = arguments.get('filter_by', '')
 
+        cached = self._tasks_cache.get(filter_by)
+        if cached and time.monotonic() - cached[0] < TASKS_CACHE_TTL:
+            return cached[1]
+
         try:
             url = f"{self.notion_url}/databases/{self.notion_database_id}/query"
             
@@ -414,48 +687,37 @@ class NotionMCPServer:
                         "select": {"equals": filter_by.title()}
                     }
 
-            response = requests.post(
-                url,
-                headers=self._get_notion_headers(),
-                json=payload
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                tasks = []
-                
-                for page in data.get('results', []):
-                    properties = page.get('properties', {})
-                    
-                    title = "Untitled"
-                    if 'Name' in properties and properties['Name'].get('title'):
-                        title = properties['Name']['title'][0]['text']['content']
-                    
-                    status = "Unknown"
-                    if 'Status' in properties and properties['Status'].get('select'):
-                        status = properties['Status']['select']['name']
-                    
-                    priority = "Unknown"
-                    if 'Priority' in properties and properties['Priority'].get('select'):
-                        priority = properties['Priority']['select']['name']
-                    
-                    tasks.append(f"• {title} [{status}] - {priority} priority")
-
-                if tasks:
-                    return [types.TextContent(
-                        type="text",
-                        text=f"📋 Found {len(tasks)} tasks:\n" + "\n".join(tasks)
-                    )]
+            async with self._get_client().stream("POST", url, content=dumps_json_bytes(payload)) as response:
+                if response.status_code == 200:
+                    tasks = []
+            
+                    # Pages are parsed as they stream in, not after the whole body
+                    async for page in _iter_results(response):
+                        properties = page.get('properties', _EMPTY)
+                        # Missing or empty properties fall back to placeholder values
+                        title = (properties.get('Name', _EMPTY).get('title') or _UNTITLED)[0]['text']['content']
+                        status = (properties.get('Status', _EMPTY).get('select') or _UNKNOWN)['name']
+                        priority = (properties.get('Priority', _EMPTY).get('select') or _UNKNOWN)['name']
+                        tasks.append(f"• {title} [{status}] - {priority} priority")
+
+                    if tasks:
+                        result = [types.TextContent(
+                            type="text",
+                            text=f"📋 Found {len(tasks)} tasks:\n" + "\n".join(tasks)
+                        )]
+                    else:
+                        result = [types.TextContent(
+                            type="text",
+                            text="📋 No tasks found in the database."
+                        )]
+                    self._tasks_cache[filter_by] = (time.monotonic(), result)
+                    return result
                 else:
+                    await response.aread()
                     return [types.TextContent(
                         type="text",
-                        text="📋 No tasks found in the database."
+                        text=f"❌ Error fetching tasks: {response.status_code} - {response.text}"
                     )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"❌ Error fetching tasks: {response.status_code} - {response.text}"
-                )]
 
         except Exception as e:
             return [types.TextContent(
@@ -465,18 +727,21 @@ class NotionMCPServer:
 
     async def run(self):
         """Run the MCP server."""
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="notion-mcp-server",
-                    server_version="0.1.0",
-                    capabilities=types.ServerCapabilities(
-                        tools=types.ToolsCapability()
+        try:
+            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="notion-mcp-server",
+                        server_version="0.1.0",
+                        capabilities=types.ServerCapabilities(
+                            tools=types.ToolsCapability()
+                        ),
                     ),
-                ),
-            )
+                )
+        finally:
+            await self.aclose()
 
 async def main():
     """Main function to run the Notion MCP server."""